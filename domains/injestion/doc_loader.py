@@ -98,6 +98,8 @@
 
 
 import base64
+import io
+import math
 import pprint
 import re
 import mimetypes
@@ -110,7 +112,13 @@ from loguru import logger
 from langchain_community.document_loaders import UnstructuredImageLoader
 from langchain_core.document_loaders import BaseLoader
 
-from domains.injestion.models import SUPPORTED_FILE_TYPES
+from domains.injestion.models import SUPPORTED_FILE_TYPES, ANIMATED_FILE_TYPES
+from domains.settings import config_settings
+
+try:
+    from PIL import Image, ImageChops, ImageStat
+except ImportError:  # pragma: no cover - Pillow is only needed for animations
+    Image = None
 
 
 class ImageProcessingError(Exception):
@@ -196,6 +204,157 @@ class ImageLoader:
             raise ImageProcessingError(f"Failed to process image: {str(e)}")
 
 
+class AnimatedImageLoader(ImageLoader):
+    """
+    Loads an animated GIF/WebP as a single contact sheet of sampled keyframes,
+    so the whole animation can be judged in one vision call.
+    """
+
+    # Candidate frames compared for near-duplicates per frame in the budget.
+    CANDIDATES_PER_FRAME = 4
+
+    def __init__(
+            self,
+            file_path: str,
+            process_type: str,
+            image_type: Optional[str] = None,
+            max_frames: Optional[int] = None,
+            grid_columns: Optional[int] = None,
+    ):
+        super().__init__(file_path, process_type, image_type)
+        settings = config_settings.ANIMATION_SETTINGS
+        self.max_frames = max(1, settings["MAX_FRAMES"] if max_frames is None else max_frames)
+        self.grid_columns = max(1, settings["GRID_COLUMNS"] if grid_columns is None else grid_columns)
+        self.max_size = settings["CONTACT_SHEET_MAX_SIZE"]
+        self.diff_threshold = settings["FRAME_DIFF_THRESHOLD"]
+        self.quality = settings["CONTACT_SHEET_QUALITY"]
+
+    @staticmethod
+    def is_animated(file_path: str) -> bool:
+        """Check whether the file is a multi-frame GIF/WebP."""
+        if Image is None or Path(file_path).suffix.lower()[1:] not in ANIMATED_FILE_TYPES:
+            return False
+        try:
+            with Image.open(file_path) as image:
+                return getattr(image, "is_animated", False) and image.n_frames > 1
+        except Exception as e:
+            logger.warning(f"Could not inspect animation frames for {file_path}: {str(e)}")
+            return False
+
+    @staticmethod
+    def _frame_signature(frame: "Image.Image") -> "Image.Image":
+        """Tiny grayscale thumbnail used for cheap frame differencing."""
+        return frame.convert("L").resize((16, 16))
+
+    def sample_frames(self, image: "Image.Image") -> list[tuple[int, "Image.Image"]]:
+        """
+        Compare evenly spaced candidate frames across the whole animation, drop
+        near-duplicates of the previously kept candidate, then decode the frame
+        budget evenly spaced over the survivors so the final frames are covered.
+        """
+        n_frames = image.n_frames
+        candidate_count = min(n_frames, self.max_frames * self.CANDIDATES_PER_FRAME)
+        if candidate_count > 1:
+            candidates = sorted({
+                round(i * (n_frames - 1) / (candidate_count - 1)) for i in range(candidate_count)
+            })
+        else:
+            candidates = [0]
+
+        survivors: list[int] = []
+        last_signature = None
+        for index in candidates:
+            image.seek(index)
+            signature = self._frame_signature(image)
+
+            if last_signature is not None:
+                difference = ImageStat.Stat(ImageChops.difference(signature, last_signature)).mean[0]
+                if difference < self.diff_threshold:
+                    continue
+
+            survivors.append(index)
+            last_signature = signature
+
+        budget = min(self.max_frames, len(survivors))
+        if budget > 1:
+            selected_indices = sorted({
+                survivors[round(i * (len(survivors) - 1) / (budget - 1))] for i in range(budget)
+            })
+        else:
+            selected_indices = survivors[:1]
+
+        selected: list[tuple[int, Image.Image]] = []
+        for index in selected_indices:
+            image.seek(index)
+            frame = image.convert("RGB")
+            frame.thumbnail((self.max_size, self.max_size))
+            selected.append((index, frame))
+
+        return selected
+
+    def build_contact_sheet(self, frames: list["Image.Image"]) -> "Image.Image":
+        """Tile frames left-to-right, top-to-bottom into one downscaled image."""
+        columns = min(self.grid_columns, len(frames))
+        rows = math.ceil(len(frames) / columns)
+        cell_size = self.max_size // max(columns, rows)
+
+        sheet = Image.new("RGB", (columns * cell_size, rows * cell_size), "white")
+        for position, frame in enumerate(frames):
+            frame = frame.copy()
+            frame.thumbnail((cell_size, cell_size))
+            row, column = divmod(position, columns)
+            sheet.paste(
+                frame,
+                (
+                    column * cell_size + (cell_size - frame.width) // 2,
+                    row * cell_size + (cell_size - frame.height) // 2,
+                ),
+            )
+        return sheet
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=4, max=10),
+        reraise=True
+    )
+    def load_and_encode(self) -> Dict[str, Any]:
+        """Sample keyframes and encode them as one JPEG contact sheet."""
+        if Image is None:
+            raise ImageProcessingError("Pillow is required to process animated images")
+
+        try:
+            with Image.open(self.file_path) as image:
+                n_frames = image.n_frames
+                sampled = self.sample_frames(image)
+
+            sheet = self.build_contact_sheet([frame for _, frame in sampled])
+            buffer = io.BytesIO()
+            sheet.save(buffer, format="JPEG", quality=self.quality)
+            encoded_image = base64.b64encode(buffer.getvalue()).decode('utf-8')
+
+            logger.info(
+                f"Built contact sheet for {self.file_path}: {len(sampled)} of {n_frames} frames"
+            )
+            return {
+                "content": encoded_image,
+                "image_url": f"data:image/jpeg;base64,{encoded_image}",
+                "metadata": {
+                    "source": str(self.file_path),
+                    "file_name": self.file_path.name,
+                    "process_type": self.process_type,
+                    "mime_type": "image/jpeg",
+                    "original_mime_type": self.image_type,
+                    "frame_count": n_frames,
+                    "sampled_frames": [index for index, _ in sampled],
+                    "grid_columns": min(self.grid_columns, len(sampled)),
+                }
+            }
+
+        except Exception as e:
+            logger.error(f"Error processing animation {self.file_path}: {str(e)}")
+            raise ImageProcessingError(f"Failed to process animation: {str(e)}")
+
+
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=4, max=10),
@@ -208,7 +367,14 @@ async def process_image(
 ) -> Dict[str, Any]:
     """Process image with retry mechanism and proper error handling."""
     try:
-        loader = ImageLoader(file_path, process_type, image_type)
+        if (
+                process_type == "base64"
+                and config_settings.ANIMATION_SETTINGS["ENABLED"]
+                and AnimatedImageLoader.is_animated(file_path)
+        ):
+            loader = AnimatedImageLoader(file_path, process_type, image_type)
+        else:
+            loader = ImageLoader(file_path, process_type, image_type)
 
         loaders: Dict[str, Callable[[], BaseLoader]] = {
             "base64": loader.load_and_encode,
@@ -6,4 +6,9 @@ SUPPORTED_FILE_TYPES = [
     'jpeg',
     'gif',
     'webp',
-]
\ No newline at end of file
+]
+
+ANIMATED_FILE_TYPES = [
+    'gif',
+    'webp',
+]
@@ -30,6 +30,10 @@ class Settings(BaseSettings):
         "OPTIMIZED_QUESTION_MODEL": os.environ.get("OPTIMIZED_QUESTION_MODEL", "gpt-4o-mini"),
         "CHAT_STREAMING_MODEL_NAME": os.environ.get("CHAT_STREAMING_MODEL_NAME", "gpt-4o-mini"),
         "SUMMARIZE_VISION_LLM_MODEL": os.environ.get("SUMMARIZE_VISION_LLM_MODEL", "gpt-4o"),
+        "SUMMARIZE_VISION_FAST_MODEL": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", "gpt-4o-mini"),
+        "SUMMARIZE_VISION_LARGE_MODEL": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", "gpt-4o"),
+        "CLASSIFICATION_FAST_MODEL": os.environ.get("CLASSIFICATION_FAST_MODEL", "gpt-4o-mini"),
+        "CLASSIFICATION_LARGE_MODEL": os.environ.get("CLASSIFICATION_LARGE_MODEL", "gpt-4o"),
     }
 
     AZURE_OPENAI_SETTINGS: ClassVar[dict] = {
@@ -57,6 +61,30 @@ class Settings(BaseSettings):
             "API_KEY": os.environ.get("SUMMARIZE_VISION_LLM_MODEL", ""),
             "DEPLOYMENT": os.environ.get("SUMMARIZE_VISION_LLM_MODEL", ""),
             "API_VERSION": os.environ.get("SUMMARIZE_VISION_LLM_MODEL", ""),
+        },
+        "SUMMARIZE_VISION_FAST_MODEL": {
+            "ENDPOINT": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", ""),
+            "API_KEY": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", ""),
+            "DEPLOYMENT": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", ""),
+            "API_VERSION": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", ""),
+        },
+        "SUMMARIZE_VISION_LARGE_MODEL": {
+            "ENDPOINT": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", ""),
+            "API_KEY": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", ""),
+            "DEPLOYMENT": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", ""),
+            "API_VERSION": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", ""),
+        },
+        "CLASSIFICATION_FAST_MODEL": {
+            "ENDPOINT": os.environ.get("CLASSIFICATION_FAST_MODEL", ""),
+            "API_KEY": os.environ.get("CLASSIFICATION_FAST_MODEL", ""),
+            "DEPLOYMENT": os.environ.get("CLASSIFICATION_FAST_MODEL", ""),
+            "API_VERSION": os.environ.get("CLASSIFICATION_FAST_MODEL", ""),
+        },
+        "CLASSIFICATION_LARGE_MODEL": {
+            "ENDPOINT": os.environ.get("CLASSIFICATION_LARGE_MODEL", ""),
+            "API_KEY": os.environ.get("CLASSIFICATION_LARGE_MODEL", ""),
+            "DEPLOYMENT": os.environ.get("CLASSIFICATION_LARGE_MODEL", ""),
+            "API_VERSION": os.environ.get("CLASSIFICATION_LARGE_MODEL", ""),
         }
 
     }
@@ -71,6 +99,10 @@ class Settings(BaseSettings):
         "OPTIMIZED_QUESTION_MODEL": os.environ.get("OPTIMIZED_QUESTION_MODEL", "gpt-4o"),
         "CHAT_STREAMING_MODEL_NAME": os.environ.get("OPENAI_CHAT_STREAMING_MODEL", "gpt-4o"),
         "SUMMARIZE_VISION_LLM_MODEL": os.environ.get("SUMMARIZE_VISION_LLM_MODEL", "gemini-1.5-vision-pro"),
+        "SUMMARIZE_VISION_FAST_MODEL": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", "gemini-1.5-flash"),
+        "SUMMARIZE_VISION_LARGE_MODEL": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", "gemini-1.5-pro"),
+        "CLASSIFICATION_FAST_MODEL": os.environ.get("CLASSIFICATION_FAST_MODEL", "gemini-1.5-flash"),
+        "CLASSIFICATION_LARGE_MODEL": os.environ.get("CLASSIFICATION_LARGE_MODEL", "gemini-1.5-pro"),
     }
 
 
@@ -84,6 +116,71 @@ class Settings(BaseSettings):
         "CLASSIFICATION_MODEL": os.environ.get("CLASSIFICATION_MODEL", "llama-3.2-3b-preview"),
         "OPTIMIZED_QUESTION_MODEL": os.environ.get("OPTIMIZED_QUESTION_MODEL", "llama-3.2-3b-preview"),
         "CHAT_STREAMING_MODEL_NAME": os.environ.get("OPENAI_CHAT_STREAMING_MODEL", "llama-3.2-3b-preview"),
+        "SUMMARIZE_VISION_FAST_MODEL": os.environ.get("SUMMARIZE_VISION_FAST_MODEL", "llama-3.2-11b-vision-preview"),
+        "SUMMARIZE_VISION_LARGE_MODEL": os.environ.get("SUMMARIZE_VISION_LARGE_MODEL", "llama-3.2-90b-vision-preview"),
+        "CLASSIFICATION_FAST_MODEL": os.environ.get("CLASSIFICATION_FAST_MODEL", "llama-3.2-3b-preview"),
+        "CLASSIFICATION_LARGE_MODEL": os.environ.get("CLASSIFICATION_LARGE_MODEL", "llama-3.1-70b-versatile"),
+    }
+
+    # Model cascade: each tier is a (vision summary model key, classification model key)
+    # pair resolved against the active service's settings, ordered from cheapest to largest.
+    CASCADE_SETTINGS: ClassVar[dict] = {
+        "ENABLED": os.environ.get("CASCADE_ENABLED", "false").lower() == "true",
+        "TIERS": [
+            {
+                "NAME": "fast",
+                "SUMMARIZE_MODEL_KEY": "SUMMARIZE_VISION_FAST_MODEL",
+                "CLASSIFICATION_MODEL_KEY": "CLASSIFICATION_FAST_MODEL",
+            },
+            {
+                "NAME": "large",
+                "SUMMARIZE_MODEL_KEY": "SUMMARIZE_VISION_LARGE_MODEL",
+                "CLASSIFICATION_MODEL_KEY": "CLASSIFICATION_LARGE_MODEL",
+            },
+        ],
+        "ESCALATE_ON_CLASSIFICATIONS": os.environ.get(
+            "CASCADE_ESCALATE_ON_CLASSIFICATIONS", "Unclear"
+        ).split(","),
+        "ESCALATE_ON_CONFIDENCE": os.environ.get(
+            "CASCADE_ESCALATE_ON_CONFIDENCE", "LOW"
+        ).split(","),
+        "SENSITIVE_CLASSIFICATIONS": os.environ.get(
+            "CASCADE_SENSITIVE_CLASSIFICATIONS", "Nudity,Harmful"
+        ).split(","),
+    }
+
+    # Animated GIF/WebP handling: sampled keyframes are tiled into one contact sheet.
+    ANIMATION_SETTINGS: ClassVar[dict] = {
+        "ENABLED": os.environ.get("ANIMATION_CONTACT_SHEET_ENABLED", "true").lower() == "true",
+        "MAX_FRAMES": int(os.environ.get("ANIMATION_MAX_FRAMES", 9)),
+        "GRID_COLUMNS": int(os.environ.get("ANIMATION_GRID_COLUMNS", 3)),
+        "CONTACT_SHEET_MAX_SIZE": int(os.environ.get("ANIMATION_CONTACT_SHEET_MAX_SIZE", 1024)),
+        "FRAME_DIFF_THRESHOLD": float(os.environ.get("ANIMATION_FRAME_DIFF_THRESHOLD", 8.0)),
+        "CONTACT_SHEET_QUALITY": int(os.environ.get("ANIMATION_CONTACT_SHEET_QUALITY", 85)),
+    }
+
+    # Batched vision summarization: small images are packed into one request, within
+    # the active service's per-request image count and payload limits.
+    BATCH_SETTINGS: ClassVar[dict] = {
+        "ENABLED": os.environ.get("BATCH_SUMMARIZATION_ENABLED", "false").lower() == "true",
+        "MAX_IMAGE_BYTES": int(os.environ.get("BATCH_MAX_IMAGE_BYTES", 256 * 1024)),
+        "ESTIMATED_TOKENS_PER_IMAGE": int(os.environ.get("BATCH_ESTIMATED_TOKENS_PER_IMAGE", 800)),
+        "MAX_CONCURRENT_REQUESTS": int(os.environ.get("BATCH_MAX_CONCURRENT_REQUESTS", 4)),
+        "MAX_IMAGES_PER_REQUEST": {
+            "openai": int(os.environ.get("OPENAI_MAX_IMAGES_PER_REQUEST", 10)),
+            "azure_openai": int(os.environ.get("AZURE_MAX_IMAGES_PER_REQUEST", 10)),
+            "groq": int(os.environ.get("GROQ_MAX_IMAGES_PER_REQUEST", 5)),
+        },
+        "MAX_PAYLOAD_BYTES": {
+            "openai": int(os.environ.get("OPENAI_MAX_PAYLOAD_BYTES", 20 * 1024 * 1024)),
+            "azure_openai": int(os.environ.get("AZURE_MAX_PAYLOAD_BYTES", 20 * 1024 * 1024)),
+            "groq": int(os.environ.get("GROQ_MAX_PAYLOAD_BYTES", 4 * 1024 * 1024)),
+        },
+        "MAX_INPUT_TOKENS": {
+            "openai": int(os.environ.get("OPENAI_MAX_BATCH_INPUT_TOKENS", 32000)),
+            "azure_openai": int(os.environ.get("AZURE_MAX_BATCH_INPUT_TOKENS", 32000)),
+            "groq": int(os.environ.get("GROQ_MAX_BATCH_INPUT_TOKENS", 7000)),
+        },
     }
 
 config_settings = Settings()
@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+
+from domains.settings import config_settings
+
+
+@dataclass
+class BatchLimits:
+    """Per-request limits for the active LLM service."""
+    max_images: int
+    max_payload_bytes: int
+    max_input_tokens: int
+    tokens_per_image: int
+    max_image_bytes: int
+
+
+@dataclass
+class ImageBatch:
+    """A group of images sent together in one vision request."""
+    image_urls: dict[str, str] = field(default_factory=dict)
+    payload_bytes: int = 0
+    estimated_tokens: int = 0
+
+
+def get_batch_limits(base_prompt_tokens: int = 0) -> BatchLimits:
+    """Resolves the batch limits for the configured LLM service."""
+    batch_settings = config_settings.BATCH_SETTINGS
+    service = config_settings.LLM_SERVICE_TYPE
+    return BatchLimits(
+        max_images=max(1, batch_settings["MAX_IMAGES_PER_REQUEST"].get(service, 1)),
+        max_payload_bytes=batch_settings["MAX_PAYLOAD_BYTES"].get(service, 0),
+        max_input_tokens=batch_settings["MAX_INPUT_TOKENS"].get(service, 0) - base_prompt_tokens,
+        tokens_per_image=batch_settings["ESTIMATED_TOKENS_PER_IMAGE"],
+        max_image_bytes=batch_settings["MAX_IMAGE_BYTES"],
+    )
+
+
+def plan_image_batches(
+        image_urls: dict[str, str],
+        limits: BatchLimits,
+) -> tuple[list[ImageBatch], list[str]]:
+    """
+    Greedily packs small images into batches that respect the image-count,
+    payload and token limits.
+
+    Args:
+        image_urls: Data URLs keyed by the caller's image ID
+        limits: Per-request limits for the active service
+
+    Returns:
+        Tuple of the planned batches and the IDs too large to batch, which
+        should be summarized one at a time
+    """
+    batches: list[ImageBatch] = []
+    singles: list[str] = []
+    current = ImageBatch()
+
+    for image_id, image_url in image_urls.items():
+        payload_bytes = len(image_url)
+        if payload_bytes > limits.max_image_bytes:
+            singles.append(image_id)
+            continue
+
+        if current.image_urls and (
+                len(current.image_urls) >= limits.max_images
+                or current.payload_bytes + payload_bytes > limits.max_payload_bytes
+                or current.estimated_tokens + limits.tokens_per_image > limits.max_input_tokens
+        ):
+            batches.append(current)
+            current = ImageBatch()
+
+        current.image_urls[image_id] = image_url
+        current.payload_bytes += payload_bytes
+        current.estimated_tokens += limits.tokens_per_image
+
+    if current.image_urls:
+        batches.append(current)
+
+    # A batch of one gains nothing over a regular single-image call.
+    for batch in [batch for batch in batches if len(batch.image_urls) == 1]:
+        batches.remove(batch)
+        singles.extend(batch.image_urls)
+
+    return batches, singles
@@ -0,0 +1,120 @@
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from loguru import logger
+
+from domains.settings import config_settings
+
+
+@dataclass(frozen=True)
+class CascadeTier:
+    """A pair of model keys used together for one tier of the cascade."""
+    name: str
+    summarize_model_key: str
+    classification_model_key: str
+
+
+DEFAULT_TIER = CascadeTier(
+    name="default",
+    summarize_model_key="SUMMARIZE_VISION_LLM_MODEL",
+    classification_model_key="CHAT_MODEL_NAME",
+)
+
+
+def get_cascade_tiers() -> list[CascadeTier]:
+    """Returns the configured cascade tiers, or the single default tier when disabled."""
+    cascade_settings = config_settings.CASCADE_SETTINGS
+    if not cascade_settings.get("ENABLED") or not cascade_settings.get("TIERS"):
+        return [DEFAULT_TIER]
+
+    return [
+        CascadeTier(
+            name=tier["NAME"],
+            summarize_model_key=tier["SUMMARIZE_MODEL_KEY"],
+            classification_model_key=tier["CLASSIFICATION_MODEL_KEY"],
+        )
+        for tier in cascade_settings["TIERS"]
+    ]
+
+
+def _normalize(values: list[str]) -> set[str]:
+    return {value.strip().lower() for value in values if value.strip()}
+
+
+def get_escalation_reason(classification: dict[str, Any]) -> Optional[str]:
+    """
+    Applies the configured escalation rules to a classification result.
+
+    Returns:
+        A short reason when the result should be re-checked by a larger tier, else None
+    """
+    cascade_settings = config_settings.CASCADE_SETTINGS
+    label = str(classification.get("classification", "")).strip().lower()
+    confidence = str(classification.get("confidence", "")).strip().lower()
+
+    if label in _normalize(cascade_settings.get("ESCALATE_ON_CLASSIFICATIONS", [])):
+        return f"classification '{label}'"
+    if confidence in _normalize(cascade_settings.get("ESCALATE_ON_CONFIDENCE", [])):
+        return f"confidence '{confidence}'"
+    if label in _normalize(cascade_settings.get("SENSITIVE_CLASSIFICATIONS", [])):
+        return f"sensitive classification '{label}'"
+    return None
+
+
+@dataclass
+class TierStats:
+    """Running counters for a single cascade tier."""
+    calls: int = 0
+    resolved: int = 0
+    escalated: int = 0
+    disagreements: int = 0
+    total_latency: float = 0.0
+
+
+@dataclass
+class CascadeStats:
+    """Collects per-tier hit rates, latency and disagreement statistics."""
+    tiers: dict[str, TierStats] = field(default_factory=dict)
+
+    def record(
+            self,
+            tier_name: str,
+            latency: float,
+            escalated: bool,
+            disagreed: bool = False,
+    ) -> None:
+        """Records the outcome of one image at one tier."""
+        stats = self.tiers.setdefault(tier_name, TierStats())
+        stats.calls += 1
+        stats.total_latency += latency
+        stats.disagreements += int(disagreed)
+        if escalated:
+            stats.escalated += 1
+        else:
+            stats.resolved += 1
+
+    def report(self) -> dict[str, dict[str, Any]]:
+        """
+        Summarizes each tier. The hit rate is the share of all classified images
+        resolved at that tier; the disagreement rate is the share of the tier's
+        calls whose label differed from the tier below it.
+        """
+        total_resolved = sum(stats.resolved for stats in self.tiers.values())
+        return {
+            tier_name: {
+                "calls": stats.calls,
+                "resolved": stats.resolved,
+                "escalated": stats.escalated,
+                "hit_rate": stats.resolved / total_resolved if total_resolved else 0.0,
+                "average_latency": stats.total_latency / stats.calls if stats.calls else 0.0,
+                "disagreements": stats.disagreements,
+                "disagreement_rate": stats.disagreements / stats.calls if stats.calls else 0.0,
+            }
+            for tier_name, stats in self.tiers.items()
+        }
+
+    def log_report(self) -> None:
+        logger.info(f"Model cascade statistics: {self.report()}")
+
+
+cascade_stats = CascadeStats()
@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Optional
+
+from loguru import logger
+
+
+class WorkflowStage(str, Enum):
+    """Stages of the image classification workflow, in execution order."""
+    LOAD = "load"
+    SUMMARIZE = "summarize"
+    CLASSIFY = "classify"
+
+
+# Stages whose completion stands in for a model call.
+MODEL_CALL_STAGES = (WorkflowStage.SUMMARIZE, WorkflowStage.CLASSIFY)
+
+
+@dataclass
+class WorkflowCheckpoint:
+    """
+    Holds the output of every completed workflow stage so a retry can resume
+    from the stage that failed instead of starting over.
+
+    Attributes:
+        image_file_path: Path of the image being classified
+        image_data: Output of the load stage (encoded image and metadata)
+        image_summary: Output of the vision summarization stage
+        raw_classification: Raw text returned by the classification model
+        classification: Parsed classification result
+        attempts: Number of workflow attempts made with this checkpoint
+        skipped_stages: Count of stage executions avoided, keyed by stage
+        repaired_responses: Number of malformed responses fixed without a new call
+        tier_index: Index of the model cascade tier the stages are running on
+        tier_results: Classifications from lower cascade tiers that were escalated
+        tier_latency: Seconds spent on the current tier, summed across attempts
+        prefilled_stages: Stages filled before the workflow ran (e.g. by batched
+            loading or summarization) whose output has not been used yet
+    """
+    image_file_path: str
+    image_data: Optional[dict[str, Any]] = None
+    image_summary: Optional[str] = None
+    raw_classification: Optional[str] = None
+    classification: Optional[dict[str, Any]] = None
+    attempts: int = 0
+    skipped_stages: dict[str, int] = field(default_factory=dict)
+    repaired_responses: int = 0
+    tier_index: int = 0
+    tier_results: list[dict[str, Any]] = field(default_factory=list)
+    tier_latency: float = 0.0
+    prefilled_stages: set[str] = field(default_factory=set)
+
+    @property
+    def completed_stages(self) -> list[WorkflowStage]:
+        """Returns the stages whose output is already checkpointed."""
+        outputs = {
+            WorkflowStage.LOAD: self.image_data,
+            WorkflowStage.SUMMARIZE: self.image_summary,
+            WorkflowStage.CLASSIFY: self.raw_classification,
+        }
+        return [stage for stage, output in outputs.items() if output is not None]
+
+    @property
+    def avoided_calls(self) -> int:
+        """Returns the number of model calls saved by resuming from checkpoints."""
+        return sum(
+            self.skipped_stages.get(stage.value, 0) for stage in MODEL_CALL_STAGES
+        ) + self.repaired_responses
+
+    def record_skip(self, stage: WorkflowStage) -> None:
+        """Records that a stage was served from its checkpoint."""
+        self.skipped_stages[stage.value] = self.skipped_stages.get(stage.value, 0) + 1
+        logger.debug(f"Resuming {self.image_file_path}: reused checkpointed {stage.value} output")
+
+    def reuse(self, stage: WorkflowStage) -> None:
+        """Records reuse of a stage output; the first use of a prefilled output is not a skip."""
+        if stage.value in self.prefilled_stages:
+            self.prefilled_stages.discard(stage.value)
+        else:
+            self.record_skip(stage)
+
+    def escalate(self, tier_name: str, reason: str) -> None:
+        """Keeps the current tier's result and clears the model stages for the next tier."""
+        self.tier_results.append({
+            "tier": tier_name,
+            "classification": self.classification,
+            "escalation_reason": reason,
+        })
+        self.image_summary = None
+        self.raw_classification = None
+        self.classification = None
+        self.tier_index += 1
+        self.tier_latency = 0.0
+
+    def savings_report(self) -> dict[str, Any]:
+        """Summarizes the work avoided by checkpointing."""
+        return {
+            "attempts": self.attempts,
+            "completed_stages": [stage.value for stage in self.completed_stages],
+            "skipped_stages": dict(self.skipped_stages),
+            "repaired_responses": self.repaired_responses,
+            "avoided_calls": self.avoided_calls,
+        }
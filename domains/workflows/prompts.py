@@ -16,6 +16,22 @@ Please provide bullet point summaries for the image in each of the following cat
 - Additional Details:
 
 If you don't know the answer for one of the categories, leave it blank."""
+
+
+CONTACT_SHEET_SUMMARY_GENERATION_PROMPT = """
+This image is a contact sheet of keyframes sampled from an animation, tiled left-to-right, top-to-bottom in playback order.
+Consider every frame, and mention content that appears in only some of the frames under Additional Details.
+""" + IMAGE_SUMMARY_GENERATION_PROMPT
+
+
+BATCH_IMAGE_SUMMARY_GENERATION_PROMPT = """
+You are given several images. Each image is preceded by a line of the form "Image ID: <id>".
+Summarize every image independently, never mixing details between images, following these instructions for each one:
+""" + IMAGE_SUMMARY_GENERATION_PROMPT + """
+
+Respond only with a JSON object mapping each image ID to its summary as a single text value, for example:
+{"img_1": "- Medium: ...\\n- Subject: ...", "img_2": "- Medium: ..."}
+If you cannot see an image clearly, map its ID to an empty string."""
 #
 #
 IMAGE_CLASSIFICATION_TEMPLATE = """
@@ -35,11 +51,13 @@ If the summary is too vague to classify, please respond with 'Unclear' and provi
 {{
     "classification": classification,
     "explanation": explanation of the classification,
+    "confidence": "HIGH" | "MEDIUM" | "LOW",
 }}
 This is a Output JSON object with the following fields:
 - image_summary: The summary of the image.
 - classification: The classification of the image.
 - explanation: An explanation for the classification.
+- confidence: HIGH, MEDIUM or LOW, based on how much the summary supports the classification.
 """
 #
 #
@@ -1,21 +1,42 @@
 import base64
 import asyncio
+import time
 import pprint
+from collections import Counter
 from typing import Union, Any, Optional
 from domains.utils import get_chat_model
 
 from functools import lru_cache
 from domains.workflows.handler import retry_with_backoff
-from domains.workflows.prompts import IMAGE_SUMMARY_GENERATION_PROMPT
+from domains.workflows.prompts import (
+    IMAGE_SUMMARY_GENERATION_PROMPT,
+    CONTACT_SHEET_SUMMARY_GENERATION_PROMPT,
+    BATCH_IMAGE_SUMMARY_GENERATION_PROMPT
+)
 from domains.workflows.prompts import initialize_image_classification_prompt
 from domains.injestion.doc_loader import process_image
+from domains.settings import config_settings
+from domains.workflows.batching import get_batch_limits, plan_image_batches
+from domains.workflows.cascade import CascadeTier, cascade_stats, get_cascade_tiers, get_escalation_reason
+from domains.workflows.checkpoint import WorkflowCheckpoint, WorkflowStage
 from domains.workflows.utils import (
     summary_generation_prompt,
+    batch_summary_generation_prompt,
+    parse_json_response,
+    repair_json_response,
     InvalidInputError,
     ModelProcessingError,
-    ImageProcessingError
+    ImageProcessingError,
+    ResponseParsingError
+)
+from langchain_core.output_parsers import StrOutputParser
+from tenacity import (
+    AsyncRetrying,
+    RetryCallState,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential
 )
-from langchain_core.output_parsers import JsonOutputParser
 from domains.utils import calculate_and_log_time
 from loguru import logger
 
@@ -55,11 +76,17 @@ async def load_image(image_file_path: str, process_type: str, image_type: Option
     max_delay=10
 )
 @calculate_and_log_time
-async def summarize_image_content(image_contents: Union[str, dict[str, Any]]) -> str:
+async def summarize_image_content(
+        image_contents: Union[str, dict[str, Any]],
+        model_key: str = "SUMMARIZE_VISION_LLM_MODEL",
+        template: str = IMAGE_SUMMARY_GENERATION_PROMPT,
+) -> str:
     """Generates a summary of image content using a language model.
 
     Args:
         image_contents: Image content as URL string or dict with URL
+        model_key: Settings key of the vision model to use
+        template: Summary prompt sent alongside the image
 
     Returns:
         String containing image summary
@@ -68,7 +95,7 @@ async def summarize_image_content(image_contents: Union[str, dict[str, Any]]) ->
         ModelProcessingError: If summarization fails
     """
     try:
-        chat_model = get_cached_model("SUMMARIZE_VISION_LLM_MODEL", 0.0)
+        chat_model = get_cached_model(model_key, 0.0)
 
         if not chat_model:
             raise ModelProcessingError("Failed to initialize chat model")
@@ -78,7 +105,7 @@ async def summarize_image_content(image_contents: Union[str, dict[str, Any]]) ->
             raise InvalidInputError("Invalid image URL format")
 
         summary_response = await chat_model.ainvoke(
-            summary_generation_prompt(image_url, IMAGE_SUMMARY_GENERATION_PROMPT)
+            summary_generation_prompt(image_url, template)
         )
         return summary_response.content
 
@@ -87,47 +114,426 @@ async def summarize_image_content(image_contents: Union[str, dict[str, Any]]) ->
 
 
 
+async def _gather_with_limit(coroutines: list[Any], limit: int) -> list[Any]:
+    """Runs coroutines concurrently, at most `limit` at a time, returning results or exceptions in order."""
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coroutine):
+        async with semaphore:
+            return await coroutine
+
+    return await asyncio.gather(*(run(coroutine) for coroutine in coroutines), return_exceptions=True)
+
+
+def _summary_to_text(summary: Any) -> str:
+    """Flattens a per-image summary that the model returned as an object or list."""
+    if summary is None:
+        return ""
+    if isinstance(summary, dict):
+        return "\n".join(
+            f"{category}: {_summary_to_text(details)}" for category, details in summary.items()
+        ).strip()
+    if isinstance(summary, list):
+        return "\n".join(_summary_to_text(item) for item in summary).strip()
+    return str(summary).strip()
+
+
 @calculate_and_log_time
-async def classify_image_content(image_summary: Union[str, dict[str, Any]]) -> dict[str, Any]:
-    """Classifies image content based on its summary using a language model.
+async def summarize_image_batch(
+        image_urls: dict[str, str],
+        model_key: str = "SUMMARIZE_VISION_LLM_MODEL",
+) -> dict[str, Optional[str]]:
+    """Summarizes several images in a single vision request.
+
+    Args:
+        image_urls: Data URLs keyed by the caller's image ID
+        model_key: Settings key of the vision model to use
+
+    Returns:
+        Summary per caller image ID, or None where the response was missing or ambiguous
+
+    Raises:
+        ModelProcessingError: If the request fails or its response cannot be parsed
+    """
+    # Short positional labels keep the caller's IDs (often file paths) out of the prompt.
+    labels = {f"img_{index}": image_id for index, image_id in enumerate(image_urls, start=1)}
+    try:
+        chat_model = get_cached_model(model_key, 0.0)
+
+        if not chat_model:
+            raise ModelProcessingError("Failed to initialize chat model")
+
+        summary_response = await chat_model.ainvoke(
+            batch_summary_generation_prompt(
+                {label: image_urls[image_id] for label, image_id in labels.items()},
+                BATCH_IMAGE_SUMMARY_GENERATION_PROMPT,
+            )
+        )
+        batch_summaries = parse_json_response(summary_response.content)
+
+    except Exception as e:
+        raise ModelProcessingError(f"Failed to summarize image batch: {str(e)}") from e
+
+    batch_summaries = {str(label).strip().lower(): summary for label, summary in batch_summaries.items()}
+    summaries: dict[str, Optional[str]] = {}
+    for label, image_id in labels.items():
+        summary = _summary_to_text(batch_summaries.get(label))
+        summaries[image_id] = summary or None
+
+    # The same text under several IDs means the model merged images together.
+    summary_counts = Counter(summary for summary in summaries.values() if summary)
+    return {
+        image_id: summary if summary and summary_counts[summary] == 1 else None
+        for image_id, summary in summaries.items()
+    }
+
+
+async def summarize_image_batches(
+        image_urls: dict[str, str],
+        model_key: str = "SUMMARIZE_VISION_LLM_MODEL",
+) -> dict[str, Optional[str]]:
+    """Summarizes the images that fit into batched vision requests, running the
+    batches concurrently up to BATCH_SETTINGS["MAX_CONCURRENT_REQUESTS"].
+
+    Args:
+        image_urls: Data URLs keyed by the caller's image ID
+        model_key: Settings key of the vision model to use
+
+    Returns:
+        Summary per image ID, or None for images that were too large to batch
+        or came back missing or ambiguous
+    """
+    summaries: dict[str, Optional[str]] = dict.fromkeys(image_urls)
+    if not config_settings.BATCH_SETTINGS["ENABLED"]:
+        return summaries
+
+    limits = get_batch_limits(base_prompt_tokens=len(BATCH_IMAGE_SUMMARY_GENERATION_PROMPT) // 4)
+    batches, _ = plan_image_batches(image_urls, limits)
+    results = await _gather_with_limit(
+        [summarize_image_batch(batch.image_urls, model_key) for batch in batches],
+        config_settings.BATCH_SETTINGS["MAX_CONCURRENT_REQUESTS"],
+    )
+    for batch, result in zip(batches, results):
+        if isinstance(result, ModelProcessingError):
+            logger.warning(f"Batched summarization of {len(batch.image_urls)} images failed: {result}")
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            summaries.update(result)
+
+    logger.info(
+        f"Batched {sum(summary is not None for summary in summaries.values())} of {len(image_urls)} "
+        f"image summaries into {len(batches)} vision calls"
+    )
+    return summaries
+
+
+@calculate_and_log_time
+async def generate_classification_response(
+        image_summary: Union[str, dict[str, Any]],
+        model_key: str = "CHAT_MODEL_NAME",
+) -> str:
+    """Runs the classification model and returns its raw, unparsed response.
 
     Args:
         image_summary: Text summary or dict containing image information
+        model_key: Settings key of the classification model to use
 
     Returns:
-        Dictionary containing classification results
+        Raw text returned by the classification model
 
     Raises:
-        ModelProcessingError: If classification fails
+        ModelProcessingError: If the model call fails
     """
     try:
         logger.debug(f"Classifying image content: {image_summary}")
 
-        llm = get_cached_model("CHAT_MODEL_NAME", 0.0)
+        llm = get_cached_model(model_key, 0.0)
         if not llm:
             raise ModelProcessingError("Failed to initialize language model")
 
-        chain = initialize_image_classification_prompt() | llm | JsonOutputParser()
-        classified_response = await chain.ainvoke({"image_summary": image_summary})
+        chain = initialize_image_classification_prompt() | llm | StrOutputParser()
+        return await chain.ainvoke({"image_summary": image_summary})
 
-        if classified_response:
-            classified_response['image_summary'] = image_summary
+    except Exception as e:
+        raise ModelProcessingError(f"Failed to classify image: {str(e)}") from e
 
-        return classified_response
 
-    except Exception as e:
+def parse_classification_response(
+        raw_response: str,
+        image_summary: Union[str, dict[str, Any]],
+        checkpoint: Optional[WorkflowCheckpoint] = None,
+) -> dict[str, Any]:
+    """Parses a raw classification response, repairing malformed JSON locally.
+
+    Args:
+        raw_response: Raw text returned by the classification model
+        image_summary: Summary the classification was made from
+        checkpoint: Optional checkpoint credited when a repair avoids a new call
+
+    Returns:
+        Dictionary containing classification results
+
+    Raises:
+        ResponseParsingError: If the response cannot be parsed or repaired
+    """
+    classified_response, repaired = repair_json_response(raw_response)
+    if repaired and checkpoint is not None:
+        checkpoint.repaired_responses += 1
+
+    classified_response['image_summary'] = image_summary
+    return classified_response
+
+
+@calculate_and_log_time
+async def classify_image_content(image_summary: Union[str, dict[str, Any]]) -> dict[str, Any]:
+    """Classifies image content based on its summary using a language model.
+
+    Args:
+        image_summary: Text summary or dict containing image information
+
+    Returns:
+        Dictionary containing classification results
+
+    Raises:
+        ModelProcessingError: If classification fails
+    """
+    raw_response = await generate_classification_response(image_summary)
+    try:
+        return parse_classification_response(raw_response, image_summary)
+    except ResponseParsingError as e:
         raise ModelProcessingError(f"Failed to classify image: {str(e)}") from e
 
 
+async def _run_tier_stages(
+        checkpoint: WorkflowCheckpoint,
+        tier: CascadeTier,
+        summary_template: str,
+) -> None:
+    """Runs the summarize and classify stages of one cascade tier, reusing checkpoints."""
+    if checkpoint.image_summary is None:
+        checkpoint.image_summary = await summarize_image_content(
+            checkpoint.image_data.get("image_url"), tier.summarize_model_key, summary_template
+        )
+    else:
+        checkpoint.reuse(WorkflowStage.SUMMARIZE)
+
+    if checkpoint.raw_classification is None:
+        checkpoint.raw_classification = await generate_classification_response(
+            checkpoint.image_summary, tier.classification_model_key
+        )
+    else:
+        checkpoint.reuse(WorkflowStage.CLASSIFY)
+
+    try:
+        checkpoint.classification = parse_classification_response(
+            checkpoint.raw_classification, checkpoint.image_summary, checkpoint
+        )
+    except ResponseParsingError:
+        # The response is beyond local repair; only the classification call is retried.
+        checkpoint.raw_classification = None
+        raise
+
+
+async def run_classification_stages(
+        checkpoint: WorkflowCheckpoint,
+        process_type: str = "base64",
+        image_type: Optional[str] = None,
+) -> dict[str, Any]:
+    """Runs each workflow stage whose output is not already checkpointed.
+
+    When the model cascade is enabled the summarize and classify stages run on
+    the cheapest tier first and are repeated on the next tier only while the
+    configured escalation rules match the result.
+
+    Args:
+        checkpoint: Checkpoint holding the output of previously completed stages
+        process_type: Type of processing to apply when loading the image
+        image_type: Optional image format type
+
+    Returns:
+        Dictionary containing classification results
+
+    Raises:
+        ImageProcessingError: If image loading fails
+        ModelProcessingError: If summarization or classification fails
+        ResponseParsingError: If the classification response cannot be repaired
+    """
+    if checkpoint.image_data is None:
+        checkpoint.image_data = await load_image(checkpoint.image_file_path, process_type, image_type)
+    else:
+        checkpoint.reuse(WorkflowStage.LOAD)
+
+    summary_template = (
+        CONTACT_SHEET_SUMMARY_GENERATION_PROMPT
+        if checkpoint.image_data.get("metadata", {}).get("sampled_frames")
+        else IMAGE_SUMMARY_GENERATION_PROMPT
+    )
+
+    tiers = get_cascade_tiers()
+    while True:
+        tier = tiers[min(checkpoint.tier_index, len(tiers) - 1)]
+        started = time.perf_counter()
+        try:
+            await _run_tier_stages(checkpoint, tier, summary_template)
+        finally:
+            # Failed attempts count too, so a resumed tier reports its full latency.
+            checkpoint.tier_latency += time.perf_counter() - started
+
+        checkpoint.classification["model_tier"] = tier.name
+        is_last_tier = checkpoint.tier_index >= len(tiers) - 1
+        reason = None if is_last_tier else get_escalation_reason(checkpoint.classification)
+
+        label = str(checkpoint.classification.get("classification", "")).strip().lower()
+        previous_label = (
+            str(checkpoint.tier_results[-1]["classification"].get("classification", "")).strip().lower()
+            if checkpoint.tier_results else None
+        )
+        cascade_stats.record(
+            tier.name,
+            checkpoint.tier_latency,
+            escalated=reason is not None,
+            disagreed=previous_label is not None and previous_label != label,
+        )
+
+        if reason is None:
+            if checkpoint.tier_results:
+                checkpoint.classification["escalations"] = list(checkpoint.tier_results)
+            return checkpoint.classification
+
+        logger.info(f"Escalating {checkpoint.image_file_path} from tier '{tier.name}': {reason}")
+        checkpoint.escalate(tier.name, reason)
+
+
+@calculate_and_log_time
+async def run_image_workflow(
+        image_file_path: str,
+        process_type: str = "base64",
+        image_type: Optional[str] = None,
+        max_attempts: int = 3,
+        checkpoint: Optional[WorkflowCheckpoint] = None,
+) -> WorkflowCheckpoint:
+    """Loads, summarizes and classifies an image, resuming retries from checkpoints.
+
+    Args:
+        image_file_path: Path to the image file
+        process_type: Type of processing to apply when loading the image
+        image_type: Optional image format type
+        max_attempts: Maximum number of attempts, with exponential backoff between them
+        checkpoint: Optional checkpoint from an earlier, failed run to resume from
+
+    Returns:
+        The checkpoint, holding the classification and a record of avoided calls
+
+    Raises:
+        ImageProcessingError, ModelProcessingError, ResponseParsingError:
+            If the last attempt fails; completed stages stay on the checkpoint
+    """
+    checkpoint = checkpoint or WorkflowCheckpoint(image_file_path=image_file_path)
+
+    def log_retry(retry_state: RetryCallState) -> None:
+        logger.warning(
+            f"Workflow attempt {retry_state.attempt_number}/{max_attempts} failed for {image_file_path}: "
+            f"{retry_state.outcome.exception()}; retrying in {retry_state.next_action.sleep:.2f} seconds "
+            f"from checkpointed stages: {[stage.value for stage in checkpoint.completed_stages]}"
+        )
+
+    async for attempt in AsyncRetrying(
+        stop=stop_after_attempt(max_attempts),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception_type((ImageProcessingError, ModelProcessingError, ResponseParsingError)),
+        before_sleep=log_retry,
+        reraise=True,
+    ):
+        with attempt:
+            checkpoint.attempts += 1
+            await run_classification_stages(checkpoint, process_type, image_type)
+
+    logger.info(f"Workflow savings for {image_file_path}: {checkpoint.savings_report()}")
+    return checkpoint
+
+
+@calculate_and_log_time
+async def run_image_workflows(
+        image_file_paths: list[str],
+        process_type: str = "base64",
+        image_type: Optional[str] = None,
+        max_attempts: int = 3,
+) -> list[WorkflowCheckpoint]:
+    """Classifies many images, summarizing small still images in batched vision calls.
+
+    Images are loaded first. When batching is enabled, still images are
+    summarized together with the first cascade tier's vision model. Contact
+    sheets of animations stay out of batches so they keep their own prompt.
+    Every image then runs through run_image_workflow, which summarizes any image
+    left without a batched summary one at a time. Loads, batches and workflows
+    each run concurrently, up to BATCH_SETTINGS["MAX_CONCURRENT_REQUESTS"] at once.
+
+    Args:
+        image_file_paths: Paths to the image files
+        process_type: Type of processing to apply when loading the images
+        image_type: Optional image format type
+        max_attempts: Maximum number of attempts per image
+
+    Returns:
+        One checkpoint per image, in input order; failed images have no classification
+    """
+    checkpoints = [WorkflowCheckpoint(image_file_path=path) for path in image_file_paths]
+    concurrency = config_settings.BATCH_SETTINGS["MAX_CONCURRENT_REQUESTS"]
+
+    loaded = await _gather_with_limit(
+        [load_image(checkpoint.image_file_path, process_type, image_type) for checkpoint in checkpoints],
+        concurrency,
+    )
+    for checkpoint, result in zip(checkpoints, loaded):
+        if isinstance(result, ImageProcessingError):
+            logger.warning(f"Deferring load of {checkpoint.image_file_path} to its workflow retries: {result}")
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            checkpoint.image_data = result
+            checkpoint.prefilled_stages.add(WorkflowStage.LOAD.value)
+
+    batchable = {
+        index: checkpoint.image_data["image_url"]
+        for index, checkpoint in enumerate(checkpoints)
+        if checkpoint.image_data and not checkpoint.image_data.get("metadata", {}).get("sampled_frames")
+    }
+    if batchable:
+        summaries = await summarize_image_batches(
+            {str(index): image_url for index, image_url in batchable.items()},
+            get_cascade_tiers()[0].summarize_model_key,
+        )
+        for index in batchable:
+            if summaries[str(index)] is not None:
+                checkpoints[index].image_summary = summaries[str(index)]
+                checkpoints[index].prefilled_stages.add(WorkflowStage.SUMMARIZE.value)
+
+    results = await _gather_with_limit(
+        [
+            run_image_workflow(checkpoint.image_file_path, process_type, image_type, max_attempts, checkpoint)
+            for checkpoint in checkpoints
+        ],
+        concurrency,
+    )
+    for checkpoint, result in zip(checkpoints, results):
+        if isinstance(result, (ImageProcessingError, ModelProcessingError, ResponseParsingError)):
+            logger.error(f"Workflow failed for {checkpoint.image_file_path}: {result}")
+        elif isinstance(result, BaseException):
+            raise result
+
+    return checkpoints
+
+
 if __name__ == "__main__":
     async def main():
         try:
             image_file_path = "/Users/mohitverma/Downloads/untitled-design-28-2.jpg"
-            res = await load_image(image_file_path, "base64", 'jpg')
-            summary = await summarize_image_content(res.get("image_url"))
-            classification = await classify_image_content(summary)
-            pprint.pprint(classification)
-        except (ImageProcessingError, ModelProcessingError) as e:
+            checkpoint = await run_image_workflow(image_file_path, "base64", 'jpg')
+            pprint.pprint(checkpoint.classification)
+            pprint.pprint(checkpoint.savings_report())
+            cascade_stats.log_report()
+        except (ImageProcessingError, ModelProcessingError, ResponseParsingError) as e:
             logger.error(f"Processing failed: {str(e)}")
         except Exception as e:
             logger.error(f"Unexpected error: {str(e)}")
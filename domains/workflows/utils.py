@@ -1,4 +1,31 @@
+import json
+import re
+from typing import Any
+
 from langchain_core.messages import HumanMessage
+from langchain_core.utils.json import parse_partial_json
+from loguru import logger
+
+try:
+    import orjson
+
+    def _json_loads(text: str) -> Any:
+        return orjson.loads(text)
+
+except ImportError:  # pragma: no cover - orjson is optional
+
+    def _json_loads(text: str) -> Any:
+        return json.loads(text)
+
+
+_LENIENT_DECODER = json.JSONDecoder(strict=False)
+_CODE_FENCE_PATTERN = re.compile(r"```(?:json)?\s*(.*?)```", re.DOTALL | re.IGNORECASE)
+_JSON_LITERALS = {
+    "true": "true", "false": "false", "null": "null",
+    "True": "true", "False": "false", "None": "null",
+}
+_OPENING_QUOTES = {"'": "'", "\u201c": "\u201d", "\u2018": "\u2019"}
+_BARE_VALUE_TERMINATORS = ",:{}[]\n\"'"
 
 
 def summary_generation_prompt(
@@ -20,6 +47,18 @@ def summary_generation_prompt(
     ]
 
 
+def batch_summary_generation_prompt(
+        image_urls: dict[str, str],
+        template: str
+):
+    """Builds one message holding several images, each labelled with its ID."""
+    content = [{"type": "text", "text": template}]
+    for image_id, image_url in image_urls.items():
+        content.append({"type": "text", "text": f"Image ID: {image_id}"})
+        content.append({"type": "image_url", "image_url": {"url": image_url}})
+    return [HumanMessage(content=content)]
+
+
 class ImageProcessingError(Exception):
     """Custom exception for image processing errors"""
     pass
@@ -32,3 +71,143 @@ class ModelProcessingError(Exception):
 class InvalidInputError(Exception):
     """Custom exception for invalid input validation"""
     pass
+
+
+class ResponseParsingError(Exception):
+    """Custom exception for model responses that cannot be parsed or repaired"""
+    pass
+
+
+def _extract_json_payload(text: str) -> str:
+    """Strip code fences and any prose before the JSON object in a model response."""
+    fenced = _CODE_FENCE_PATTERN.search(text)
+    payload = fenced.group(1) if fenced else text
+
+    start = payload.find("{")
+    return payload[start:] if start != -1 else payload
+
+
+def _loads_lenient(payload: str) -> Any:
+    """
+    Parse with the fast strict loader first, then accept what JsonOutputParser
+    accepts: control characters inside strings, trailing prose after the
+    object and a response cut off before its closing braces.
+    """
+    try:
+        return _json_loads(payload)
+    except ValueError:
+        pass
+
+    try:
+        return _LENIENT_DECODER.raw_decode(payload)[0]
+    except ValueError:
+        pass
+
+    parsed = parse_partial_json(payload, strict=False)
+    if parsed is None:
+        raise ValueError("Incomplete JSON could not be closed")
+    return parsed
+
+
+def _read_quoted(payload: str, start: int) -> tuple[str, int]:
+    """Read a string opened by any supported quote and re-emit it double-quoted."""
+    closing = _OPENING_QUOTES[payload[start]]
+    chars = []
+    index = start + 1
+    while index < len(payload) and payload[index] != closing:
+        if payload[index] == "\\" and index + 1 < len(payload):
+            escaped = payload[index + 1]
+            chars.append(escaped if escaped == "'" else payload[index:index + 2])
+            index += 2
+            continue
+        chars.append('\\"' if payload[index] == '"' else payload[index])
+        index += 1
+    return '"' + "".join(chars) + '"', index + 1
+
+
+def _normalize_json_syntax(payload: str) -> str:
+    """
+    Rewrite common non-JSON syntax outside of string values: single and smart
+    quotes, trailing commas, Python literals and unquoted keys or enum values.
+    String contents are copied unchanged.
+    """
+    output = []
+    index = 0
+    while index < len(payload):
+        char = payload[index]
+
+        if char == '"':
+            end = index + 1
+            while end < len(payload) and payload[end] != '"':
+                end += 2 if payload[end] == "\\" else 1
+            output.append(payload[index:end + 1])
+            index = end + 1
+
+        elif char in _OPENING_QUOTES:
+            quoted, index = _read_quoted(payload, index)
+            output.append(quoted)
+
+        elif char == ",":
+            following = payload[index + 1:].lstrip()
+            if not following.startswith(("}", "]")):
+                output.append(char)
+            index += 1
+
+        elif char.isdigit() or char == "-":
+            end = index + 1
+            while end < len(payload) and (payload[end].isdigit() or payload[end] in ".eE+-"):
+                end += 1
+            output.append(payload[index:end])
+            index = end
+
+        elif char.isalpha() or char == "_":
+            end = index
+            while end < len(payload) and payload[end] not in _BARE_VALUE_TERMINATORS:
+                end += 1
+            word = payload[index:end].rstrip()
+            output.append(_JSON_LITERALS.get(word) or json.dumps(word))
+            index += len(word)
+
+        else:
+            output.append(char)
+            index += 1
+
+    return "".join(output)
+
+
+def repair_json_response(text: str) -> tuple[dict[str, Any], bool]:
+    """
+    Parse a JSON object out of a raw model response, repairing common defects
+    (trailing commas, single or smart quotes, Python literals, unquoted values)
+    locally instead of asking the model again.
+
+    Returns:
+        Tuple of the parsed object and whether a syntax repair was needed.
+        Anything JsonOutputParser already accepted (code fences, surrounding
+        prose, newlines inside strings, truncated output) is not a repair.
+
+    Raises:
+        ResponseParsingError: If no JSON object can be recovered
+    """
+    if not text or not text.strip():
+        raise ResponseParsingError("Empty model response")
+
+    payload = _extract_json_payload(text)
+    for repaired, candidate in ((False, payload), (True, _normalize_json_syntax(payload))):
+        try:
+            parsed = _loads_lenient(candidate)
+        except ValueError:
+            continue
+
+        if isinstance(parsed, dict):
+            if repaired:
+                logger.debug("Repaired malformed JSON response")
+            return parsed, repaired
+
+    raise ResponseParsingError(f"Could not parse JSON from model response: {text[:200]!r}")
+
+
+def parse_json_response(text: str) -> dict[str, Any]:
+    """Parse a JSON object out of a raw model response, repairing it if needed."""
+    return repair_json_response(text)[0]
+
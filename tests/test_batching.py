@@ -0,0 +1,190 @@
+import asyncio
+import json
+
+import pytest
+from tenacity import wait_none
+
+from domains.settings import config_settings
+from domains.workflows import tools
+from domains.workflows.batching import BatchLimits, plan_image_batches
+from domains.workflows.prompts import CONTACT_SHEET_SUMMARY_GENERATION_PROMPT
+
+
+def _limits(**overrides):
+    limits = dict(
+        max_images=3,
+        max_payload_bytes=1000,
+        max_input_tokens=10000,
+        tokens_per_image=800,
+        max_image_bytes=500,
+    )
+    limits.update(overrides)
+    return BatchLimits(**limits)
+
+
+def _urls(*sizes):
+    return {f"image-{index}": "x" * size for index, size in enumerate(sizes)}
+
+
+def _planned(batches):
+    return [list(batch.image_urls) for batch in batches]
+
+
+def test_batches_are_cut_at_the_image_count():
+    batches, singles = plan_image_batches(_urls(10, 10, 10, 10, 10), _limits())
+
+    assert _planned(batches) == [["image-0", "image-1", "image-2"], ["image-3", "image-4"]]
+    assert singles == []
+
+
+def test_batches_are_cut_at_the_payload_size():
+    batches, singles = plan_image_batches(_urls(400, 400, 400, 400), _limits())
+
+    assert _planned(batches) == [["image-0", "image-1"], ["image-2", "image-3"]]
+    assert all(batch.payload_bytes <= 1000 for batch in batches)
+
+
+def test_batches_are_cut_at_the_token_budget():
+    batches, _ = plan_image_batches(_urls(10, 10, 10, 10), _limits(max_input_tokens=1600))
+
+    assert _planned(batches) == [["image-0", "image-1"], ["image-2", "image-3"]]
+    assert all(batch.estimated_tokens <= 1600 for batch in batches)
+
+
+def test_oversized_images_are_summarized_alone():
+    batches, singles = plan_image_batches(_urls(10, 600, 10), _limits())
+
+    assert _planned(batches) == [["image-0", "image-2"]]
+    assert singles == ["image-1"]
+
+
+def test_single_image_batches_become_single_calls():
+    batches, singles = plan_image_batches(_urls(10, 10, 10, 10), _limits())
+
+    assert _planned(batches) == [["image-0", "image-1", "image-2"]]
+    assert singles == ["image-3"]
+
+
+class StubVisionModel:
+    def __init__(self, reply):
+        self.reply = reply
+        self.messages = []
+
+    async def ainvoke(self, messages):
+        self.messages.append(messages)
+        content = self.reply(messages) if callable(self.reply) else self.reply
+        return type("Response", (), {"content": content})()
+
+
+def _labels(messages):
+    return [
+        part["text"].split(": ", 1)[1]
+        for part in messages[0].content
+        if part["type"] == "text" and part["text"].startswith("Image ID: ")
+    ]
+
+
+def test_batch_summaries_map_back_to_caller_ids(monkeypatch):
+    model = StubVisionModel(json.dumps({
+        "img_1": "A cat on a sofa.",
+        "img_2": "  ",
+        "img_4": "Same text.",
+        "IMG_5": "Same text.",
+        "img_6": {"Medium": "Photo", "Subject": "A dog"},
+    }))
+    monkeypatch.setattr(tools, "get_cached_model", lambda *args: model)
+    image_ids = ["/a.png", "/b.png", "/c.png", "/d.png", "/e.png", "/f.png"]
+
+    summaries = asyncio.run(
+        tools.summarize_image_batch({image_id: f"data:{image_id}" for image_id in image_ids})
+    )
+
+    assert _labels(model.messages[0]) == ["img_1", "img_2", "img_3", "img_4", "img_5", "img_6"]
+    assert summaries == {
+        "/a.png": "A cat on a sofa.",
+        "/b.png": None,
+        "/c.png": None,
+        "/d.png": None,
+        "/e.png": None,
+        "/f.png": "Medium: Photo\nSubject: A dog",
+    }
+
+
+def test_fenced_batch_reply_with_newlines_in_summaries(monkeypatch):
+    reply = (
+        '```json\n'
+        '{"img_1": "- Medium: photo\n- Subject: a cat",\n'
+        ' "img_2": "- Medium: drawing\n- Subject: a tree"}\n'
+        '```'
+    )
+    monkeypatch.setattr(tools, "get_cached_model", lambda *args: StubVisionModel(reply))
+
+    summaries = asyncio.run(tools.summarize_image_batch({"a": "data:a", "b": "data:b"}))
+
+    assert summaries == {
+        "a": "- Medium: photo\n- Subject: a cat",
+        "b": "- Medium: drawing\n- Subject: a tree",
+    }
+
+
+@pytest.fixture
+def batch_workflow(monkeypatch):
+    monkeypatch.setitem(config_settings.BATCH_SETTINGS, "ENABLED", True)
+    monkeypatch.setitem(config_settings.BATCH_SETTINGS, "MAX_CONCURRENT_REQUESTS", 2)
+    monkeypatch.setitem(config_settings.CASCADE_SETTINGS, "ENABLED", False)
+    state = {"in_flight": 0, "max_in_flight": 0, "single_summaries": []}
+
+    async def load_image(image_file_path, *args):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        await asyncio.sleep(0.01)
+        state["in_flight"] -= 1
+        metadata = {"sampled_frames": [0, 10]} if image_file_path.endswith(".gif") else {}
+        return {"image_url": f"data:{image_file_path}", "metadata": metadata}
+
+    async def summarize_image_content(image_url, model_key, template=None):
+        state["single_summaries"].append((image_url, template == CONTACT_SHEET_SUMMARY_GENERATION_PROMPT))
+        return f"single summary of {image_url}"
+
+    async def generate_classification_response(*args):
+        return '{"classification": "Safe", "confidence": "HIGH"}'
+
+    # The batch reply omits the last still image, which must fall back to a single call.
+    model = StubVisionModel(
+        lambda messages: json.dumps({label: f"batched {label}" for label in _labels(messages)[:-1]})
+    )
+    monkeypatch.setattr(tools, "load_image", load_image)
+    monkeypatch.setattr(tools, "summarize_image_content", summarize_image_content)
+    monkeypatch.setattr(tools, "generate_classification_response", generate_classification_response)
+    monkeypatch.setattr(tools, "get_cached_model", lambda *args: model)
+    monkeypatch.setattr(tools, "wait_exponential", lambda **kwargs: wait_none())
+    return state, model
+
+
+def test_workflows_use_batched_summaries(batch_workflow):
+    state, model = batch_workflow
+    paths = ["a.png", "b.png", "c.png", "d.gif"]
+
+    checkpoints = asyncio.run(tools.run_image_workflows(paths, image_type="png"))
+
+    assert len(model.messages) == 1
+    assert [checkpoint.image_summary for checkpoint in checkpoints[:2]] == ["batched img_1", "batched img_2"]
+    assert state["single_summaries"] == [("data:c.png", False), ("data:d.gif", True)]
+    assert all(checkpoint.classification["classification"] == "Safe" for checkpoint in checkpoints)
+
+
+def test_preloaded_and_batched_stages_are_not_counted_as_skips(batch_workflow):
+    checkpoints = asyncio.run(tools.run_image_workflows(["a.png", "b.png", "c.png"], image_type="png"))
+
+    for checkpoint in checkpoints:
+        assert checkpoint.skipped_stages == {}
+        assert checkpoint.avoided_calls == 0
+        assert checkpoint.prefilled_stages == set()
+
+
+def test_loads_run_concurrently_within_the_limit(batch_workflow):
+    state, _ = batch_workflow
+
+    asyncio.run(tools.run_image_workflows([f"{index}.png" for index in range(6)], image_type="png"))
+
+    assert state["max_in_flight"] == 2
@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+from tenacity import wait_none
+
+from domains.settings import config_settings
+from domains.workflows import tools
+from domains.workflows.cascade import CascadeStats, get_cascade_tiers, get_escalation_reason
+
+TIERS = [
+    {"NAME": "fast", "SUMMARIZE_MODEL_KEY": "FAST_VISION", "CLASSIFICATION_MODEL_KEY": "FAST_TEXT"},
+    {"NAME": "large", "SUMMARIZE_MODEL_KEY": "LARGE_VISION", "CLASSIFICATION_MODEL_KEY": "LARGE_TEXT"},
+]
+
+
+@pytest.fixture
+def cascade_settings(monkeypatch):
+    settings = config_settings.CASCADE_SETTINGS
+    monkeypatch.setitem(settings, "ENABLED", True)
+    monkeypatch.setitem(settings, "TIERS", TIERS)
+    monkeypatch.setitem(settings, "ESCALATE_ON_CLASSIFICATIONS", ["Unclear", ""])
+    monkeypatch.setitem(settings, "ESCALATE_ON_CONFIDENCE", ["LOW", " "])
+    monkeypatch.setitem(settings, "SENSITIVE_CLASSIFICATIONS", ["Nudity", "Harmful", ""])
+    return settings
+
+
+@pytest.mark.parametrize("classification, expected", [
+    ({"classification": "unclear", "confidence": "HIGH"}, "classification 'unclear'"),
+    ({"classification": "Safe", "confidence": "low"}, "confidence 'low'"),
+    ({"classification": "HARMFUL", "confidence": "HIGH"}, "sensitive classification 'harmful'"),
+    ({"classification": "Safe", "confidence": "HIGH"}, None),
+    ({}, None),
+])
+def test_escalation_reason(cascade_settings, classification, expected):
+    assert get_escalation_reason(classification) == expected
+
+
+def test_disabled_cascade_uses_default_tier(cascade_settings, monkeypatch):
+    monkeypatch.setitem(cascade_settings, "ENABLED", False)
+    assert [tier.name for tier in get_cascade_tiers()] == ["default"]
+
+
+def test_stats_report():
+    stats = CascadeStats()
+    stats.record("fast", 1.0, escalated=True)
+    stats.record("fast", 3.0, escalated=False)
+    stats.record("fast", 2.0, escalated=False)
+    stats.record("large", 4.0, escalated=False, disagreed=True)
+
+    report = stats.report()
+
+    assert report["fast"]["calls"] == 3
+    assert report["fast"]["hit_rate"] == pytest.approx(2 / 3)
+    assert report["fast"]["average_latency"] == pytest.approx(2.0)
+    assert report["fast"]["disagreement_rate"] == 0.0
+    assert report["large"]["hit_rate"] == pytest.approx(1 / 3)
+    assert report["large"]["disagreements"] == 1
+    assert report["large"]["disagreement_rate"] == 1.0
+
+
+@pytest.fixture
+def stub_tiers(monkeypatch):
+    responses = {}
+    summarized_with = []
+
+    async def load_image(*args, **kwargs):
+        return {"image_url": "data:image/png;base64,AAAA", "metadata": {}}
+
+    async def summarize_image_content(image_url, model_key, template=None):
+        summarized_with.append(model_key)
+        return f"summary from {model_key}"
+
+    async def generate_classification_response(image_summary, model_key):
+        return responses[model_key]
+
+    stats = CascadeStats()
+    monkeypatch.setattr(tools, "load_image", load_image)
+    monkeypatch.setattr(tools, "summarize_image_content", summarize_image_content)
+    monkeypatch.setattr(tools, "generate_classification_response", generate_classification_response)
+    monkeypatch.setattr(tools, "wait_exponential", lambda **kwargs: wait_none())
+    monkeypatch.setattr(tools, "cascade_stats", stats)
+    return responses, summarized_with, stats
+
+
+@pytest.mark.parametrize("fast_response", [
+    '{"classification": "Unclear", "confidence": "HIGH"}',
+    '{"classification": "Safe", "confidence": "LOW"}',
+])
+def test_uncertain_fast_result_escalates(cascade_settings, stub_tiers, fast_response):
+    responses, summarized_with, stats = stub_tiers
+    responses.update({
+        "FAST_TEXT": fast_response,
+        "LARGE_TEXT": '{"classification": "Offensive", "confidence": "HIGH"}',
+    })
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+    result = checkpoint.classification
+
+    assert summarized_with == ["FAST_VISION", "LARGE_VISION"]
+    assert result["model_tier"] == "large"
+    assert result["image_summary"] == "summary from LARGE_VISION"
+    assert [escalation["tier"] for escalation in result["escalations"]] == ["fast"]
+    report = stats.report()
+    assert report["fast"]["escalated"] == 1
+    assert report["large"]["resolved"] == 1
+    assert report["large"]["disagreements"] == 1
+
+
+def test_confident_fast_result_is_not_escalated(cascade_settings, stub_tiers):
+    responses, summarized_with, stats = stub_tiers
+    responses["FAST_TEXT"] = '{"classification": "Safe", "confidence": "HIGH"}'
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+
+    assert summarized_with == ["FAST_VISION"]
+    assert checkpoint.classification["model_tier"] == "fast"
+    assert "escalations" not in checkpoint.classification
+    assert stats.report()["fast"]["hit_rate"] == 1.0
+
+
+def test_last_tier_never_escalates(cascade_settings, stub_tiers):
+    responses, summarized_with, stats = stub_tiers
+    responses.update({
+        "FAST_TEXT": '{"classification": "Unclear", "confidence": "LOW"}',
+        "LARGE_TEXT": '{"classification": "Unclear", "confidence": "LOW"}',
+    })
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+
+    assert summarized_with == ["FAST_VISION", "LARGE_VISION"]
+    assert checkpoint.classification["model_tier"] == "large"
+    assert checkpoint.classification["classification"] == "Unclear"
+    assert stats.report()["large"]["escalated"] == 0
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from tenacity import wait_none
+
+from domains.workflows import tools
+from domains.workflows.checkpoint import WorkflowCheckpoint
+from domains.workflows.utils import ModelProcessingError
+
+VALID_RESPONSE = '{"classification": "Safe", "explanation": "A cat.", "confidence": "HIGH"}'
+
+
+@pytest.fixture
+def stub_stages(monkeypatch):
+    calls = {"load": 0, "summarize": 0, "classify": 0}
+    classify_responses = []
+
+    async def load_image(*args, **kwargs):
+        calls["load"] += 1
+        return {"image_url": "data:image/png;base64,AAAA", "metadata": {}}
+
+    async def summarize_image_content(*args, **kwargs):
+        calls["summarize"] += 1
+        return "A cat on a sofa."
+
+    async def generate_classification_response(*args, **kwargs):
+        calls["classify"] += 1
+        response = classify_responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(tools, "load_image", load_image)
+    monkeypatch.setattr(tools, "summarize_image_content", summarize_image_content)
+    monkeypatch.setattr(tools, "generate_classification_response", generate_classification_response)
+    monkeypatch.setattr(tools, "wait_exponential", lambda **kwargs: wait_none())
+    return calls, classify_responses
+
+
+def test_failed_classification_call_resumes_after_summary(stub_stages):
+    calls, classify_responses = stub_stages
+    classify_responses.extend([ModelProcessingError("timeout"), VALID_RESPONSE])
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+
+    assert checkpoint.classification["classification"] == "Safe"
+    assert calls == {"load": 1, "summarize": 1, "classify": 2}
+    assert checkpoint.attempts == 2
+    assert checkpoint.skipped_stages == {"load": 1, "summarize": 1}
+    assert checkpoint.avoided_calls == 1
+
+
+def test_unrepairable_response_only_repeats_classification(stub_stages):
+    calls, classify_responses = stub_stages
+    classify_responses.extend(["I cannot answer that.", VALID_RESPONSE])
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+
+    assert checkpoint.classification["classification"] == "Safe"
+    assert calls == {"load": 1, "summarize": 1, "classify": 2}
+    assert checkpoint.skipped_stages == {"load": 1, "summarize": 1}
+    assert checkpoint.avoided_calls == 1
+
+
+def test_repaired_response_avoids_a_retry(stub_stages):
+    calls, classify_responses = stub_stages
+    classify_responses.append("{'classification': 'Safe', 'confidence': HIGH,}")
+
+    checkpoint = asyncio.run(tools.run_image_workflow("cat.png", image_type="png"))
+
+    assert checkpoint.classification["confidence"] == "HIGH"
+    assert calls == {"load": 1, "summarize": 1, "classify": 1}
+    assert checkpoint.attempts == 1
+    assert checkpoint.skipped_stages == {}
+    assert checkpoint.repaired_responses == 1
+    assert checkpoint.avoided_calls == 1
+
+
+def test_resumes_from_a_caller_supplied_checkpoint(stub_stages):
+    calls, classify_responses = stub_stages
+    classify_responses.append(VALID_RESPONSE)
+    checkpoint = WorkflowCheckpoint(
+        image_file_path="cat.png",
+        image_data={"image_url": "data:image/png;base64,AAAA", "metadata": {}},
+        image_summary="A cat on a sofa.",
+    )
+
+    asyncio.run(tools.run_image_workflow("cat.png", checkpoint=checkpoint))
+
+    assert calls == {"load": 0, "summarize": 0, "classify": 1}
+    assert checkpoint.avoided_calls == 1
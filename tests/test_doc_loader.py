@@ -0,0 +1,70 @@
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+
+from domains.injestion.doc_loader import AnimatedImageLoader
+
+
+def _write_gif(path, n_frames):
+    frames = [
+        Image.new("RGB", (64, 48), ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256))
+        for i in range(n_frames)
+    ]
+    frames[0].save(path, save_all=True, append_images=frames[1:], duration=40)
+    return str(path)
+
+
+def test_sampled_frames_span_the_whole_animation(tmp_path):
+    file_path = _write_gif(tmp_path / "long.gif", 300)
+    loader = AnimatedImageLoader(file_path, "base64", "gif", max_frames=9)
+
+    with Image.open(file_path) as image:
+        n_frames = image.n_frames
+        sampled = [index for index, _ in loader.sample_frames(image)]
+
+    assert len(sampled) == 9
+    assert sampled[0] == 0
+    # Within two candidate steps of the end, allowing for a deduplicated final frame.
+    candidate_step = n_frames // (9 * AnimatedImageLoader.CANDIDATES_PER_FRAME)
+    assert sampled[-1] >= n_frames - 1 - 2 * candidate_step
+
+
+def test_near_duplicate_frames_are_dropped(tmp_path):
+    # A moving one-pixel marker keeps Pillow from merging identical frames on save.
+    frames = []
+    for i in range(100):
+        frame = Image.new("RGB", (64, 48), "black" if i < 50 else "white")
+        frame.putpixel((i % 64, 0), (128, 128, 128))
+        frames.append(frame)
+    file_path = str(tmp_path / "two_scenes.gif")
+    frames[0].save(file_path, save_all=True, append_images=frames[1:], duration=40)
+    loader = AnimatedImageLoader(file_path, "base64", "gif", max_frames=9)
+
+    with Image.open(file_path) as image:
+        assert image.n_frames == 100
+        sampled = [index for index, _ in loader.sample_frames(image)]
+
+        loader.diff_threshold = -1
+        undeduplicated = loader.sample_frames(image)
+
+    assert len(sampled) == 2
+    assert sampled[0] < 50 <= sampled[1]
+    assert len(undeduplicated) == 9
+
+
+def test_zero_frame_budget_is_clamped_to_one(tmp_path):
+    file_path = _write_gif(tmp_path / "short.gif", 20)
+    loader = AnimatedImageLoader(file_path, "base64", "gif", max_frames=0, grid_columns=0)
+
+    assert loader.max_frames == 1
+    assert loader.grid_columns == 1
+
+
+def test_load_and_encode_builds_contact_sheet(tmp_path):
+    file_path = _write_gif(tmp_path / "sheet.gif", 30)
+    result = AnimatedImageLoader(file_path, "base64", "gif", max_frames=4, grid_columns=2).load_and_encode()
+
+    assert result["image_url"].startswith("data:image/jpeg;base64,")
+    assert result["metadata"]["frame_count"] == 30
+    assert len(result["metadata"]["sampled_frames"]) == 4
+    assert result["metadata"]["sampled_frames"][-1] == 29
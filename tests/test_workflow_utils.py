@@ -0,0 +1,99 @@
+import pytest
+
+from domains.workflows.utils import (
+    ResponseParsingError,
+    parse_json_response,
+    repair_json_response,
+)
+
+
+def test_valid_json_is_not_a_repair():
+    assert repair_json_response('{"classification": "Safe"}') == ({"classification": "Safe"}, False)
+
+
+def test_code_fence_is_not_a_repair():
+    text = 'Here you go:\n```json\n{"classification": "Safe"}\n```'
+    assert repair_json_response(text) == ({"classification": "Safe"}, False)
+
+
+def test_surrounding_prose_is_not_a_repair():
+    text = 'The result is {"classification": "Safe"} as requested.'
+    assert repair_json_response(text) == ({"classification": "Safe"}, False)
+
+
+def test_newline_inside_string_is_not_a_repair():
+    text = '{"classification": "Safe", "explanation": "line1\nline2"}'
+    assert repair_json_response(text) == (
+        {"classification": "Safe", "explanation": "line1\nline2"},
+        False,
+    )
+
+
+def test_truncated_response_is_closed():
+    text = '{"classification": "Safe", "explanation": "cut off mid'
+    assert repair_json_response(text) == (
+        {"classification": "Safe", "explanation": "cut off mid"},
+        False,
+    )
+
+
+def test_trailing_prose_with_braces_is_ignored():
+    text = '{"classification": "Safe"}\nNote: {x} was not considered.'
+    assert repair_json_response(text) == ({"classification": "Safe"}, False)
+
+
+def test_trailing_commas_are_removed():
+    text = '{"classification": "Safe", "tags": ["a", "b",],}'
+    assert repair_json_response(text) == ({"classification": "Safe", "tags": ["a", "b"]}, True)
+
+
+def test_single_quotes_are_converted():
+    text = "{'classification': 'Safe', 'explanation': 'say \"hi\"'}"
+    assert repair_json_response(text) == (
+        {"classification": "Safe", "explanation": 'say "hi"'},
+        True,
+    )
+
+
+def test_smart_quotes_are_converted():
+    text = "{“classification”: “Safe”}"
+    assert repair_json_response(text) == ({"classification": "Safe"}, True)
+
+
+def test_python_literals_are_converted():
+    text = '{"flagged": False, "reviewed": True, "notes": None}'
+    assert repair_json_response(text) == (
+        {"flagged": False, "reviewed": True, "notes": None},
+        True,
+    )
+
+
+def test_unquoted_enum_values_are_quoted():
+    text = '{"classification": Unclear, "confidence": LOW}'
+    assert repair_json_response(text) == ({"classification": "Unclear", "confidence": "LOW"}, True)
+
+
+def test_string_contents_are_not_rewritten():
+    text = '{"explanation": "None visible, True to life", "confidence": LOW,}'
+    assert repair_json_response(text) == (
+        {"explanation": "None visible, True to life", "confidence": "LOW"},
+        True,
+    )
+
+
+def test_apostrophes_inside_double_quoted_strings_are_kept():
+    text = '{"explanation": "the man\'s hat", "confidence": "HIGH",}'
+    assert repair_json_response(text) == (
+        {"explanation": "the man's hat", "confidence": "HIGH"},
+        True,
+    )
+
+
+def test_numbers_are_kept():
+    assert parse_json_response('{"score": -1.5e3, "count": 2,}') == {"score": -1500.0, "count": 2}
+
+
+@pytest.mark.parametrize("text", ["", "   ", "no json here", '{"a": "x",, }'])
+def test_unrepairable_responses_raise(text):
+    with pytest.raises(ResponseParsingError):
+        repair_json_response(text)